@@ -1,3 +1,4 @@
 from .file import file_cache
 from .timed import lru_cache
+from .timed import ttl_cache
 from .timer import timeit
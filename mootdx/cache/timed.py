@@ -1,4 +1,5 @@
 import functools
+import time
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
@@ -58,3 +59,63 @@ def lru_cache(seconds: Optional[int] = None, maxsize: Optional[int] = None, type
         return cast(PandasFunc, retrieve_cache)
 
     return decorator
+
+
+def is_empty(value) -> bool:
+    """
+    判断返回数据是否为空
+
+    :param value: 要判断的值
+    :return: bool
+    """
+    if isinstance(value, pd.DataFrame):
+        return len(value.index) == 0
+
+    if isinstance(value, pd.Series):
+        return value.empty
+
+    return not value
+
+
+def ttl_cache(seconds: int = 60, maxsize: int = 256):
+    """
+    实例方法缓存装饰器, 缓存保存在实例的 _ttl_cache 中, 随实例一起释放
+
+    命中时返回副本, 避免调用方修改缓存数据; 空结果不缓存.
+
+    :param seconds: 缓存有效秒数
+    :param maxsize: 每个实例最多缓存的条目数
+    :return: decorator
+    """
+
+    def clone(value):
+        return value.copy() if hasattr(value, 'copy') else value
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            key = (func.__name__, args, frozenset(kwargs.items()))
+
+            try:
+                hash(key)
+            except TypeError:
+                return func(self, *args, **kwargs)
+
+            cache = self.__dict__.setdefault('_ttl_cache', {})
+            expires, value = cache.get(key, (0, None))
+
+            if expires > time.monotonic():
+                return clone(value)
+
+            result = func(self, *args, **kwargs)
+
+            if not is_empty(result):
+                cache.pop(key, None)
+                len(cache) >= maxsize and cache.pop(next(iter(cache)))
+                cache[key] = (time.monotonic() + seconds, clone(result))
+
+            return result
+
+        return wrapper
+
+    return decorator
@@ -1,4 +1,11 @@
+import asyncio
+import functools
+import ipaddress
+import itertools
 import math
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 import pandas
@@ -14,11 +21,15 @@ from tenacity import wait_random
 from tqdm import tqdm
 
 from mootdx import config
+from mootdx.cache import ttl_cache
+from mootdx.cache.timed import is_empty
 from mootdx.consts import MARKET_SH, MARKET_SZ
 from mootdx.consts import return_last_value
+from mootdx.exceptions import MootdxException
 from mootdx.exceptions import MootdxValidationException
 from mootdx.logger import logger
 from mootdx.server import check_server
+from mootdx.utils import CONCAT_OPTIONS
 from mootdx.utils import get_frequency
 from mootdx.utils import get_stock_market
 from mootdx.utils import get_stock_markets
@@ -44,14 +55,29 @@ class Quotes(object):
         return StdQuotes(**kwargs)
 
 
-def valid_server(server):
-    import ipaddress
+@functools.lru_cache(maxsize=4096)
+def _normalize_server(address, port):
+    ipaddress.ip_address(address)
+    return address, int(port)
+
+
+# 构造客户端前需要剔除的参数
+_STRIP = frozenset(('verbose', 'server', 'quiet', 'heartbeat', 'multithread', 'auto_retry'))
+_EXT_STRIP = frozenset(('verbose', 'server', 'quiet'))
+
+# 指数代码前缀为 00, 88, 99 的属于沪市
+_SH_PREFIXES = frozenset(('00', '88', '99'))
+
 
+@functools.lru_cache(maxsize=8192)
+def _pick_market(symbol):
+    return MARKET_SH if symbol[:2] in _SH_PREFIXES else MARKET_SZ
+
+
+def valid_server(server):
     if isinstance(server, tuple) or isinstance(server, list):
         try:
-            address, port = server
-            ipaddress.ip_address(address)
-            return address, int(port)
+            return _normalize_server(*server)
         except Exception:
             raise ValueError('Server 格式错误. 例如: server = ("127.0.0.1", 2272)')
 
@@ -63,6 +89,15 @@ class BaseQuotes(object):
     bestip = None
     server = None
 
+    # 并发请求的工作连接数量
+    workers = 8
+    clients = None
+    idle = None
+    lock = None
+    spawning = 0
+    waiting = 0
+    generation = 0
+
     def __init__(self, server=None, bestip: bool = False, timeout: int = None, **kwargs) -> None:
 
         logger.debug(f'server => {server}')
@@ -77,6 +112,8 @@ class BaseQuotes(object):
         logger.debug('config.setup()')
         config.setup()
 
+        self.setup_pool()
+
     def __del__(self):
         logger.debug('call __del__')
         self.close()
@@ -90,6 +127,9 @@ class BaseQuotes(object):
         logger.debug('close')
         hasattr(self.client, 'close') and self.client.close()
 
+        for client in self.drain_pool():
+            client is not self.client and client.close()
+
     @property
     def closed(self) -> bool:
         if not hasattr(self.client.client, '_closed') or getattr(self.client.client, '_closed'):
@@ -97,11 +137,182 @@ class BaseQuotes(object):
 
         return False
 
-    def pool(self):
-        ...
+    def setup_pool(self):
+        """
+        初始化工作连接池
+        """
+
+        self.lock = threading.Lock()
+        self.clients, self.idle, self.spawning, self.waiting = [], queue.Queue(), 0, 0
+
+    def drain_pool(self):
+        """
+        清空连接池, 仍在创建中的连接就绪后直接关闭, 不再加入连接池
+
+        :return: list 连接池中原有的客户端
+        """
+
+        if self.lock is None:
+            return []
+
+        with self.lock:
+            self.generation += 1
+            clients, self.spawning = list(self.clients), 0
+            self.clients.clear()
 
+            while not self.idle.empty():
+                self.idle.get_nowait()
 
-instance: BaseQuotes
+        return clients
+
+    def spawn(self):
+        """
+        创建一个工作连接, 与主连接使用同一个客户端类型和服务器
+
+        :return: 已连接的客户端
+        """
+
+        ip, port = self.server[-2:]
+        client = self.client.__class__(heartbeat=False, auto_retry=True, raise_exception=False)
+
+        if not client.connect(ip, int(port), time_out=self.timeout):
+            raise ConnectionError(f'工作连接创建失败: {ip}:{port}')
+
+        return client
+
+    def pool(self, size=1):
+        """
+        工作连接池, 首次使用时复用主连接, 并在后台并发扩充到 size 个连接 (不超过 workers)
+
+        TdxHq_API 的 socket 不是线程安全的, 每个工作连接同一时间只处理一个请求.
+        扩充不阻塞调用方, 请求先在已有连接上执行, 新连接就绪后加入空闲队列.
+
+        :param size: 需要的连接数量
+        :return: queue.Queue 空闲连接队列
+        """
+
+        with self.lock:
+            if not self.clients and self.alive(self.client):
+                self.clients.append(self.client)
+                self.idle.put(self.client)
+
+            count = max(min(size, self.workers) - len(self.clients) - self.spawning, 0)
+            self.spawning += count
+            generation = self.generation
+
+        for _ in range(count):
+            threading.Thread(target=self.join_pool, args=(generation,), daemon=True).start()
+
+        return self.idle
+
+    def join_pool(self, generation=0):
+        """
+        创建工作连接并加入连接池, 创建失败的连接直接丢弃
+
+        连接池已清空 (generation 变化), 或者没有请求在等待连接时, 就绪的连接直接关闭.
+
+        :param generation: 发起创建时的连接池代数
+        """
+
+        try:
+            client = self.spawn()
+        except Exception as ex:  # noqa
+            logger.warning(ex)
+            client = None
+
+        with self.lock:
+            current = generation == self.generation
+            self.spawning = max(self.spawning - 1, 0) if current else self.spawning
+
+            if client is not None and current and (self.waiting or not self.clients):
+                self.clients.append(client)
+                self.idle.put(client)
+                client = None
+
+        client is not None and client.close()
+
+    @staticmethod
+    def alive(client):
+        """
+        判断客户端是否已连接
+
+        :param client: 客户端
+        :return: bool
+        """
+
+        return client is not None and not getattr(client, 'closed', False) and getattr(client, 'client', 1) is not None
+
+    def request(self, method, **kwargs):
+        """
+        独占一个空闲的工作连接执行请求, 没有空闲连接时按需扩充连接池
+
+        :param method: 客户端方法名称
+        :param kwargs: 请求参数
+        :return: 请求结果
+        """
+
+        idle = self.pool()
+
+        with self.lock:
+            self.waiting += 1
+
+            # 等待的请求多于空闲和创建中的连接时才扩充
+            size = len(self.clients) - idle.qsize() + self.waiting
+
+        try:
+            self.pool(size)
+
+            while True:
+                try:
+                    client = idle.get(timeout=1)
+                    break
+                except queue.Empty:
+                    if not self.clients and not self.spawning:
+                        raise ConnectionError('没有可用的服务器连接')
+        finally:
+            with self.lock:
+                self.waiting -= 1
+
+        try:
+            return getattr(client, method)(**kwargs)
+        finally:
+            with self.lock:
+                # 连接池已清空时不再放回
+                client in self.clients and idle.put(client)
+
+    def parallel(self, method, params, progress=False, strict=False, request=None):
+        """
+        使用线程池并发请求
+
+        :param method: 客户端方法名称
+        :param params: 参数列表, 每一项为一次请求的 dict 参数
+        :param progress: 是否显示进度条
+        :param strict: 请求失败 (返回 None) 时重试一次, 仍然失败则抛出异常
+        :param request: 单次请求函数, 默认 self.request, 可传入带重试策略的版本
+        :return: list 请求结果, 顺序与 params 一致
+        """
+
+        if not params:
+            return []
+
+        request = request or self.request
+
+        with ThreadPoolExecutor(max_workers=min(len(params), self.workers)) as executor:
+            results = executor.map(lambda kwargs: request(method, **kwargs), params)
+            results = list(tqdm(results, total=len(params), ascii=True) if progress else results)
+
+        if strict:
+            for index, result in enumerate(results):
+                if result is None:
+                    results[index] = request(method, **params[index])
+
+                if results[index] is None:
+                    raise MootdxException(message=f'请求失败: {method} {params[index]}')
+
+        return results
+
+
+instance: BaseQuotes = None
 
 
 def check_empty(value):
@@ -111,7 +322,7 @@ def check_empty(value):
     :param value: 要判断的值
     :return:
     """
-    _empty = value.all().empty if isinstance(value, pd.DataFrame) else not value
+    _empty = is_empty(value)
 
     # 判断状态空，则重连接
     if instance and _empty:
@@ -121,6 +332,15 @@ def check_empty(value):
     return _empty
 
 
+# ExtQuotes 接口共用的重试策略: 异常或返回空值时重试, 最多 3 次
+_RETRY = retry(
+    wait=wait_random(min=1, max=10),
+    stop=stop_after_attempt(3),
+    retry_error_callback=return_last_value,
+    retry=(retry_if_exception_type() | retry_if_result(check_empty)),
+)
+
+
 class StdQuotes(BaseQuotes):
     """
     股票市场实时行情"""
@@ -136,22 +356,23 @@ class StdQuotes(BaseQuotes):
         super().__init__(bestip=bestip, timeout=timeout, server=server, **kwargs)
         self.server and config.set('BESTIP', {'HQ': self.server})
 
+        servers, best = config.get('SERVER'), config.get('BESTIP')
+
         try:
-            config.get('SERVER').get('HQ')[0]
+            servers.get('HQ')[0]
         except ValueError as ex:
             logger.warning(ex)
         finally:
-            default = config.get('SERVER').get('HQ')[0][1:]
-            self.server = config.get('BESTIP').get('HQ', default)
+            default = servers.get('HQ')[0][1:]
+            self.server = best.get('HQ', default)
 
-        for x in ['verbose', 'server', 'quiet', 'heartbeat', 'multithread', 'auto_retry']:
-            if x in kwargs.keys():
-                del kwargs[x]
+        kwargs = {k: v for k, v in kwargs.items() if k not in _STRIP}
 
         logger.debug(f'server: {self.server}')
         ip, port = self.server
 
-        self.client = TdxHq_API(heartbeat=False, auto_retry=True, raise_exception=False, **kwargs)
+        # 主连接同时作为工作连接使用, 开启线程锁保证并发安全
+        self.client = TdxHq_API(heartbeat=False, multithread=True, auto_retry=True, raise_exception=False, **kwargs)
         self.client.connect(ip, int(port), time_out=timeout)
 
         global instance
@@ -160,6 +381,22 @@ class StdQuotes(BaseQuotes):
     def traffic(self):
         return self.client.get_traffic_stats()
 
+    @staticmethod
+    def _sh_sz_market(symbol):
+        """
+        获取沪深市场代码, 其它市场抛出异常
+
+        :param symbol: 股票代码
+        :return: int
+        """
+
+        market = get_stock_market(symbol, string=False)
+
+        if market not in (MARKET_SZ, MARKET_SH):
+            raise MootdxValidationException('市场代码错误, 目前只支持沪深市场')
+
+        return market
+
     def quotes(self, symbol=None, **kwargs):
         """
         获取实时日行情数据
@@ -182,7 +419,7 @@ class StdQuotes(BaseQuotes):
 
         return to_data(result, symbol=symbol, client=self, **kwargs)
 
-    def bars(self, symbol='000001', frequency=9, start=0, offset=800, **kwargs):
+    def bars(self, symbol='000001', frequency=9, start=0, offset=800, raw=False, **kwargs):
         """
         获取实时日K线数据
 
@@ -190,6 +427,7 @@ class StdQuotes(BaseQuotes):
         :param frequency: 数据频次
         :param start: 开始位置
         :param offset: 每次获取条数
+        :param raw: 返回原始数据, 不转换为 pd.DataFrame
         :return: pd.dataFrame or None
         """
         frequency = get_frequency(frequency)
@@ -198,6 +436,9 @@ class StdQuotes(BaseQuotes):
         offset = (offset, 800)[offset > 800]
         result = self.client.get_security_bars(int(frequency), int(market), str(symbol), int(start), int(offset))
 
+        if raw:
+            return result
+
         return to_data(result, symbol=symbol, client=self, **kwargs)
 
     def stock_count(self, market=MARKET_SH):
@@ -225,25 +466,37 @@ class StdQuotes(BaseQuotes):
         if market not in [0, 1]:
             raise MootdxValidationException('市场代码错误, 目前只支持沪深市场')
 
-        counts = self.stock_count(market=market)
-        stocks = None
+        results, start = [], 0
 
-        if counts > 0:
-            for start in tqdm(range(0, counts, 1000), ascii=True):
-                result = self.client.get_security_list(market=market, start=start)
-                stocks = pandas.concat([stocks, to_data(result)], ignore_index=True) if start > 1 else to_data(result)
+        # 每轮并发请求 workers 页 (每页 1000 条), 第一个不足 1000 条的页为最后一页
+        while True:
+            params = [{'market': market, 'start': start + i * 1000} for i in range(self.workers)]
+            pages = self.parallel('get_security_list', params, strict=True)
+            short = next((i for i, x in enumerate(pages) if len(x) < 1000), None)
 
-        return stocks
+            if short is None:
+                results.extend(pages)
+                start += len(params) * 1000
+                continue
 
-    def stock_all(self):
-        stocks = None
+            if any(pages[short + 1 :]):
+                raise MootdxException(message=f'股票列表分页数据异常: start={params[short]["start"]} 之后仍有数据')
+
+            results.extend(pages[: short + 1])
+            break
 
-        for m in [0, 1]:
-            stocks = pandas.concat([stocks, self.stocks(m)], ignore_index=True)
+        # 合并原始数据后一次性构造 DataFrame
+        stocks = list(itertools.chain.from_iterable(results))
 
-        return stocks
+        return to_data(stocks) if stocks else None
 
-    def index_bars(self, symbol='000001', frequency=9, start=0, offset=800, **kwargs):
+    def stock_all(self):
+        parts = [self.stocks(m) for m in (MARKET_SZ, MARKET_SH)]
+        parts = [x for x in parts if x is not None]
+
+        return pandas.concat(parts, ignore_index=True, **CONCAT_OPTIONS) if parts else None
+
+    def index_bars(self, symbol='000001', frequency=9, start=0, offset=800, raw=False, **kwargs):
         """
         获取指数k线
 
@@ -251,15 +504,19 @@ class StdQuotes(BaseQuotes):
         :param frequency: 数据频次
         :param start: 开始位置
         :param offset: 获取数量
+        :param raw: 返回原始数据, 不转换为 pd.DataFrame
         :return:
         """
 
         frequency = get_frequency(frequency)
         offset = (offset, 800)[offset > 800]
 
-        market = (MARKET_SZ, MARKET_SH)[symbol[:2] in ["00", "88", "99"]]
+        market = _pick_market(symbol)
         result = self.client.get_index_bars(int(frequency), int(market), str(symbol), int(start), int(offset))
 
+        if raw:
+            return result
+
         return to_data(result, symbol=symbol, client=self, **kwargs)
 
     def minute(self, symbol=None, **kwargs):
@@ -282,11 +539,7 @@ class StdQuotes(BaseQuotes):
         :return: pd.dataFrame or None
         """
 
-        market = get_stock_market(symbol)
-
-        if market not in [0, 1]:
-            raise MootdxValidationException('市场代码错误, 目前只支持沪深市场')
-
+        market = self._sh_sz_market(symbol)
         result = self.client.get_history_minute_time_data(market=market, code=symbol, date=date)
 
         return to_data(result, symbol=symbol, client=self, **kwargs)
@@ -318,11 +571,7 @@ class StdQuotes(BaseQuotes):
         :return: pd.dataFrame or None
         """
 
-        market = get_stock_market(symbol, string=False)
-
-        if market not in [0, 1]:
-            raise MootdxValidationException('市场代码错误, 目前只支持沪深市场')
-
+        market = self._sh_sz_market(symbol)
         result = self.client.get_history_transaction_data(market, symbol, start, offset, int(date))
         return to_data(result, symbol=symbol, client=self, **kwargs)
 
@@ -334,11 +583,7 @@ class StdQuotes(BaseQuotes):
         :return: pd.dataFrame or None
         """
 
-        market = int(get_stock_market(symbol))
-
-        if market not in [0, 1]:
-            raise MootdxValidationException('市场代码错误, 目前只支持沪深市场')
-
+        market = self._sh_sz_market(symbol)
         result = self.client.get_company_info_category(market, symbol)
 
         return result
@@ -352,12 +597,7 @@ class StdQuotes(BaseQuotes):
         :return: pd.dataFrame or None
         """
 
-        result = {}
-        market = int(get_stock_market(symbol, string=False))
-
-        if market not in [0, 1]:
-            raise MootdxValidationException('市场代码错误, 目前只支持沪深市场')
-
+        market = self._sh_sz_market(symbol)
         category = self.client.get_company_info_category(market, symbol)
 
         if not category:
@@ -374,12 +614,16 @@ class StdQuotes(BaseQuotes):
                         length=x['length'],
                     )
 
-        for x in category:
-            result[x['name']] = self.client.get_company_info_content(
-                market=market, code=symbol, filename=x['filename'], start=x['start'], length=x['length']
-            )
+        params = [
+            {'market': market, 'code': symbol, 'filename': x['filename'], 'start': x['start'], 'length': x['length']}
+            for x in category
+        ]
+        result = self.parallel('get_company_info_content', params)
 
-        return result
+        # 失败的章节重试一次, 仍然失败时保留 None, 其他章节照常返回
+        result = [self.request('get_company_info_content', **y) if x is None else x for x, y in zip(result, params)]
+
+        return dict(zip([x['name'] for x in category], result))
 
     def xdxr(self, symbol='', **kwargs):
         """
@@ -424,35 +668,40 @@ class StdQuotes(BaseQuotes):
         return self.k(**kwargs)
 
     def get_k_data(self, code, start_date, end_date):
-        # 开始时间离现在有几天
-        first = (pd.to_datetime(end_date) - pd.to_datetime(datetime.now().date())).days
-        first = (abs(first), 0)[first >= 0]
+        today = pd.Timestamp.today().normalize()
 
         # 结束时间离现在有几天
-        last = (pd.to_datetime(start_date) - pd.to_datetime(datetime.now().date())).days
-        last = (abs(last), 0)[last >= 0]
+        first = max(0, (today - pd.Timestamp(end_date)).days)
+
+        # 开始时间离现在有几天
+        last = max(0, (today - pd.Timestamp(start_date)).days)
 
         # 去除节假日
         first -= int(first / 2.8)  # 非交易日大概是全年的1/3
         last -= int(last / 3.5)  # 非交易日大概是全年的1/3
 
-        temp = []
         market = get_stock_market(code)
-
-        for i in range(math.ceil((last - first) / 800)):
-            data = self.client.get_security_bars(9, market, code, (first + i * 800), 800)
-            temp.append(self.client.to_df(data))
-
-        data = pd.concat(temp)
-        data = data.assign(date=data['datetime'].apply(lambda x: str(x)[0:10])).assign(code=str(code))
-        data = data.set_index('date', drop=False, inplace=False)
-        data = data.drop(['year', 'month', 'day', 'hour', 'minute', 'datetime'], axis=1)
-        data = data.loc[(data.date >= start_date) & (data.date < end_date)]
+        params = [
+            {'category': 9, 'market': market, 'code': code, 'start': first + i * 800, 'count': 800}
+            for i in range(math.ceil((last - first) / 800))
+        ]
+
+        # 并发请求, 合并原始数据后一次性构造 DataFrame
+        chunks = self.parallel('get_security_bars', params, strict=True)
+        data = pd.DataFrame(list(itertools.chain.from_iterable(chunks)))
+        date = pd.DatetimeIndex(pd.to_datetime(data['datetime'], cache=True), name='date').normalize()
+
+        data = data.drop(columns=['year', 'month', 'day', 'hour', 'minute', 'datetime'])
+        data = data.assign(date=date, code=str(code))
+        data.index = date
         data = data.sort_index()
 
+        # 有序 DatetimeIndex 切片 (二分查找), 区间为 [start_date, end_date)
+        data = data.loc[pd.Timestamp(start_date) : pd.Timestamp(end_date) - pd.Timedelta(1, 's')]
+
         return data
 
-    def index(self, symbol='000001', frequency=9, start=0, offset=800, **kwargs):
+    def index(self, symbol='000001', frequency=9, start=0, offset=800, raw=False, **kwargs):
         """
         获取指数k线
 
@@ -475,14 +724,18 @@ class StdQuotes(BaseQuotes):
         :param market:      证券市场
         :param start:       开始位置
         :param offset:      每次获取条数
+        :param raw:         返回原始数据, 不转换为 pd.DataFrame
         :return: pd.dataFrame or None
         """
         frequency = get_frequency(frequency)
 
         offset = (offset, 800)[offset > 800]
-        market = (MARKET_SZ, MARKET_SH)[symbol[:2] in ["00", "88", "99"]]
+        market = _pick_market(symbol)
         result = self.client.get_index_bars(int(frequency), int(market), str(symbol), int(start), int(offset))
 
+        if raw:
+            return result
+
         return to_data(result, symbol=symbol, client=self, **kwargs)
 
     def block(self, tofile='block.dat', **kwargs):
@@ -515,17 +768,20 @@ class ExtQuotes(BaseQuotes):
 
         logger.warning('目前扩展市场行情接口已经失效, 后期有望修复.')
 
+        servers, best = config.get('SERVER'), config.get('BESTIP')
+
         try:
-            config.get('SERVER').get('EX')[0]
+            servers.get('EX')[0]
         except ValueError as ex:
             logger.warning(ex)
         finally:
-            default = config.get('SERVER').get('EX')[0]
-            self.server = config.get('BESTIP').get('EX', default)
+            default = servers.get('EX')[0]
+            self.server = best.get('EX', default)
+
+        kwargs = {k: v for k, v in kwargs.items() if k not in _EXT_STRIP}
 
-        for x in ['verbose', 'server', 'quiet']:
-            if x in kwargs.keys():
-                del kwargs[x]
+        # 主连接同时作为工作连接使用, 开启线程锁保证并发安全
+        kwargs['multithread'] = True
 
         try:
             self.client = TdxExHq_API(raise_exception=False, auto_retry=True, **kwargs)
@@ -556,12 +812,8 @@ class ExtQuotes(BaseQuotes):
 
         return int(market), symbol
 
-    @retry(
-        wait=wait_random(min=1, max=10),
-        stop=stop_after_attempt(3),
-        retry_error_callback=return_last_value,
-        retry=(retry_if_exception_type() | retry_if_result(check_empty)),
-    )
+    @ttl_cache(seconds=60, maxsize=256)
+    @_RETRY
     def markets(self, **kwargs):
         """
         获取实时市场列表
@@ -572,12 +824,8 @@ class ExtQuotes(BaseQuotes):
         result = self.client.get_markets()
         return to_data(result, **kwargs)
 
-    @retry(
-        wait=wait_random(min=1, max=10),
-        stop=stop_after_attempt(3),
-        retry_error_callback=return_last_value,
-        retry=(retry_if_exception_type() | retry_if_result(check_empty)),
-    )
+    @ttl_cache(seconds=60, maxsize=256)
+    @_RETRY
     def instrument(self, start=0, offset=800, **kwargs):
         """
         查询代码列表
@@ -590,12 +838,8 @@ class ExtQuotes(BaseQuotes):
         result = self.client.get_instrument_info(start=start, count=offset)
         return to_data(result, **kwargs)
 
-    @retry(
-        wait=wait_random(min=1, max=10),
-        stop=stop_after_attempt(3),
-        retry_error_callback=return_last_value,
-        retry=(retry_if_exception_type() | retry_if_result(check_empty)),
-    )
+    @ttl_cache(seconds=60, maxsize=256)
+    @_RETRY
     def instrument_count(self):
         """
         市场商品数量
@@ -607,12 +851,7 @@ class ExtQuotes(BaseQuotes):
 
         return result
 
-    @retry(
-        wait=wait_random(min=1, max=10),
-        stop=stop_after_attempt(3),
-        retry_error_callback=return_last_value,
-        retry=(retry_if_exception_type() | retry_if_result(check_empty)),
-    )
+    @_RETRY
     def instruments(self, **kwargs):
         """
         查询所有代码列表
@@ -620,22 +859,15 @@ class ExtQuotes(BaseQuotes):
         :return:
         """
 
-        result = []
-
         count = self.client.get_instrument_count()
         pages = math.ceil(count / 100)
 
-        for page in tqdm(range(0, pages), ascii=True):
-            result += self.client.get_instrument_info(page * 100, 100)
+        params = [{'start': page * 100, 'count': 100} for page in range(0, pages)]
+        chunks = self.parallel('get_instrument_info', params, progress=True, strict=True)
 
-        return to_data(result, **kwargs)
+        return to_data(list(itertools.chain.from_iterable(chunks)), **kwargs)
 
-    @retry(
-        wait=wait_random(min=1, max=10),
-        stop=stop_after_attempt(3),
-        retry_error_callback=return_last_value,
-        retry=(retry_if_exception_type() | retry_if_result(check_empty)),
-    )
+    @_RETRY
     def quote(self, market='', symbol='', **kwargs):
         """
         查询五档行情
@@ -650,12 +882,57 @@ class ExtQuotes(BaseQuotes):
 
         return to_data(result, symbol=symbol, client=self, **kwargs)
 
-    @retry(
-        wait=wait_random(min=1, max=10),
-        stop=stop_after_attempt(3),
-        retry_error_callback=return_last_value,
-        retry=(retry_if_exception_type() | retry_if_result(check_empty)),
-    )
+    @_RETRY
+    def _request(self, method, **kwargs):
+        """
+        在工作连接上执行请求, 与 quote 使用相同的重试策略
+
+        :param method: 客户端方法名称
+        :param kwargs: 请求参数
+        :return: 请求结果
+        """
+
+        return self.request(method, **kwargs)
+
+    async def aquote(self, market='', symbol='', **kwargs):
+        """
+        异步查询五档行情, 请求在独立的工作连接上执行, 可配合 asyncio.gather 并发
+
+        :param market: 市场ID
+        :param symbol: 证券代码
+        :return:
+        """
+
+        market, symbol = self.validate(market, symbol)
+
+        loop = asyncio.get_running_loop()
+        request = functools.partial(self._request, 'get_instrument_quote', market=market, code=symbol)
+        result = await loop.run_in_executor(None, request)
+
+        return to_data(result, symbol=symbol, client=self, **kwargs)
+
+    def quotes(self, symbols=None, **kwargs):
+        """
+        批量查询五档行情
+
+        :param symbols: 证券列表, 例如 [(47, 'IF1709'), '42#IMCI']
+        :return:
+        """
+
+        if not symbols:
+            return to_data(None)
+
+        symbols = [self.validate(*x) if isinstance(x, (tuple, list)) else self.validate('', x) for x in symbols]
+
+        params = [{'market': market, 'code': symbol} for market, symbol in symbols]
+        result = self.parallel('get_instrument_quote', params, request=self._request)
+
+        # 每个证券对应一行, 与 symbols 顺序一致; 查询失败的只保留市场和代码
+        rows = [x[0] if x else {'market': market, 'code': symbol} for x, (market, symbol) in zip(result, symbols)]
+
+        return to_data(rows, **kwargs)
+
+    @_RETRY
     def minute(self, market='', symbol='', **kwargs):
         """
         查询分时行情
@@ -670,12 +947,7 @@ class ExtQuotes(BaseQuotes):
 
         return to_data(result, symbol=symbol, client=self, **kwargs)
 
-    @retry(
-        wait=wait_random(min=1, max=10),
-        stop=stop_after_attempt(3),
-        retry_error_callback=return_last_value,
-        retry=(retry_if_exception_type() | retry_if_result(check_empty)),
-    )
+    @_RETRY
     def minutes(self, market=None, symbol='', date='', **kwargs):
         """
         查询历史分时行情
@@ -691,13 +963,8 @@ class ExtQuotes(BaseQuotes):
 
         return to_data(result, symbol=symbol, client=self, **kwargs)
 
-    @retry(
-        wait=wait_random(min=1, max=10),
-        stop=stop_after_attempt(3),
-        retry_error_callback=return_last_value,
-        retry=(retry_if_exception_type() | retry_if_result(check_empty)),
-    )
-    def bars(self, frequency='', market='', symbol='', start=0, offset=800, **kwargs):
+    @_RETRY
+    def bars(self, frequency='', market='', symbol='', start=0, offset=800, raw=False, **kwargs):
         """
         查询k线数据
 
@@ -706,6 +973,7 @@ class ExtQuotes(BaseQuotes):
         :param symbol: 证券代码
         :param start:  起始位置
         :param offset: 获取数量
+        :param raw: 返回原始数据, 不转换为 pd.DataFrame
         :return:
         """
 
@@ -715,14 +983,12 @@ class ExtQuotes(BaseQuotes):
             category=frequency, market=market, code=symbol, start=start, count=offset
         )
 
+        if raw:
+            return result
+
         return to_data(result, symbol=symbol, **kwargs)
 
-    @retry(
-        wait=wait_random(min=1, max=10),
-        stop=stop_after_attempt(3),
-        retry_error_callback=return_last_value,
-        retry=(retry_if_exception_type() | retry_if_result(check_empty)),
-    )
+    @_RETRY
     def transaction(self, market=None, symbol='', start=0, offset=800, **kwargs):
         """
         查询分笔成交
@@ -739,12 +1005,7 @@ class ExtQuotes(BaseQuotes):
 
         return to_data(result, symbol=symbol, client=self, **kwargs)
 
-    @retry(
-        wait=wait_random(min=1, max=10),
-        stop=stop_after_attempt(3),
-        retry_error_callback=return_last_value,
-        retry=(retry_if_exception_type() | retry_if_result(check_empty)),
-    )
+    @_RETRY
     def transactions(self, market=None, symbol='', date='', start=0, offset=800, **kwargs):
         """
         查询历史分笔成交
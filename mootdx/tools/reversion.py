@@ -2,6 +2,8 @@ import logging
 
 import pandas as pd
 
+from mootdx.utils import CONCAT_OPTIONS
+
 logger = logging.getLogger(__name__)
 
 
@@ -12,15 +14,18 @@ def _reversion(bfq_data, xdxr_data, type_):
 
     if len(info) > 0:
         # 有除权数据
-        data = pd.concat([bfq_data, info.loc[bfq_data.index[0]: bfq_data.index[-1], ['category']]], axis=1)
+        data = pd.concat(
+            [bfq_data, info.loc[bfq_data.index[0]: bfq_data.index[-1], ['category']]], axis=1, **CONCAT_OPTIONS)
         data['if_trade'].fillna(value=0, inplace=True)
 
         data = data.fillna(method='ffill')
         data = pd.concat(
             [data, info.loc[bfq_data.index[0]: bfq_data.index[-1], ['fenhong', 'peigu', 'peigujia', 'songzhuangu']]],
-            axis=1)
+            axis=1, **CONCAT_OPTIONS)
     else:
-        data = pd.concat([bfq_data, info.loc[:, ['category', 'fenhong', 'peigu', 'peigujia', 'songzhuangu']]], axis=1)
+        data = pd.concat(
+            [bfq_data, info.loc[:, ['category', 'fenhong', 'peigu', 'peigujia', 'songzhuangu']]],
+            axis=1, **CONCAT_OPTIONS)
 
     # 数据补全
     data = data.fillna(0)
@@ -68,7 +73,7 @@ def etf_reversion(data, xdxr, adjust='01'):
     data['date'] = pd.to_datetime(data[['year', 'month', 'day']], utc=False)
 
     data = data.set_index(['date'])
-    data = pd.concat([data, xdxr.loc[data.index[0]: data.index[-1], ['suogu', 'category']]], axis=1)
+    data = pd.concat([data, xdxr.loc[data.index[0]: data.index[-1], ['suogu', 'category']]], axis=1, **CONCAT_OPTIONS)
 
     if adjust.lower() in ['01', 'qfq']:
         # 前复权向前移动一天
@@ -1,3 +1,4 @@
+import functools
 import hashlib
 from pathlib import Path
 from struct import calcsize
@@ -13,6 +14,9 @@ from mootdx.consts import MARKET_SH
 from mootdx.consts import MARKET_SZ
 from mootdx.logger import logger
 
+# pandas 3 起 concat 默认写时复制, copy 参数已弃用; 旧版本传入 copy=False 避免复制
+CONCAT_OPTIONS = {'copy': False} if int(pd.__version__.split('.')[0]) < 3 else {}
+
 
 def get_stock_markets(symbols=None):
     results = []
@@ -26,6 +30,7 @@ def get_stock_markets(symbols=None):
     return results
 
 
+@functools.lru_cache(maxsize=4096)
 def get_stock_market(symbol='', string=False):
     """判断股票ID对应的证券市场匹配规则
 
@@ -261,6 +266,7 @@ FREQUENCY = ['5m', '15m', '30m', '1h', 'days', 'week', 'mon', 'ex_1m', '1m', 'da
 # FREQUENCY = ["5m", "15m", "30m", "1h", "days", "week", "mon", "ex_1m", "1m", "day", "3mon", "year"]
 
 
+@functools.lru_cache(maxsize=4096)
 def get_frequency(frequency) -> int:
     # FREQUENCY = ['5m', '15m', '30m', '1h', 'day', 'week', 'mon', '1m', '1m', 'day', '3mon', 'year']
 
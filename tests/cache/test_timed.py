@@ -0,0 +1,39 @@
+import pandas as pd
+
+from mootdx.cache import ttl_cache
+
+
+class Sample(object):
+    def __init__(self, data):
+        self.data, self.calls = data, 0
+
+    @ttl_cache(seconds=60, maxsize=2)
+    def fetch(self, key):
+        self.calls += 1
+        return pd.DataFrame(self.data)
+
+
+def test_ttl_cache_per_instance():
+    a, b = Sample({'x': [1]}), Sample({'x': [2]})
+
+    assert a.fetch(1)['x'].tolist() == [1]
+    assert b.fetch(1)['x'].tolist() == [2]
+    assert a.fetch(1) is not a.fetch(1)
+    assert a.calls == 1 and b.calls == 1
+
+
+def test_ttl_cache_maxsize():
+    client = Sample({'x': [1]})
+
+    for key in (1, 2, 3, 1):
+        client.fetch(key)
+
+    assert client.calls == 4
+    assert len(client._ttl_cache) == 2
+
+
+def test_ttl_cache_skip_empty():
+    client = Sample({})
+
+    assert client.fetch(1).empty and client.fetch(1).empty
+    assert client.calls == 2
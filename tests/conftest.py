@@ -1,7 +1,13 @@
+import copy
+import time
+
 import pandas
 import pytest
 
+from mootdx.quotes import BaseQuotes
+from mootdx.quotes import ExtQuotes
 from mootdx.quotes import Quotes
+from mootdx.quotes import StdQuotes
 
 
 def is_empty(obj):
@@ -18,3 +24,135 @@ def quotes():
 # @pytest.fixture()
 # def reader():
 #     return Reader.factory("std")
+
+
+class FakeClient(object):
+    """
+    离线测试用的行情客户端, 按 start 或 code 模拟请求失败
+
+    clone 出来的工作连接共享数据、失败配置和调用记录 log, calls 只统计自身的调用次数.
+
+    :param total: 证券列表或合约的总数
+    :param delay: 每次请求的耗时
+    :param failed: 始终返回 None 的 start 或 code
+    :param flaky: 第一次返回 None 的 start 或 code
+    :param extra: 超出 total 仍返回数据的 start
+    :param markets: get_markets 的返回值
+    """
+
+    def __init__(self, total=0, delay=0, failed=(), flaky=(), extra=(), markets=None):
+        self.total, self.delay = total, delay
+        self.failed, self.flaky, self.extra = set(failed), set(flaky), set(extra)
+        self.markets = [{'market': 47, 'name': 'IF'}] if markets is None else markets
+        self.days = pandas.bdate_range(end=pandas.Timestamp.today().normalize(), periods=3000)
+        self.calls, self.log, self.closed = 0, [], False
+
+    def clone(self):
+        client = copy.copy(self)
+        client.calls, client.closed = 0, False
+        return client
+
+    def reply(self, key, data):
+        time.sleep(self.delay)
+        self.calls += 1
+        self.log.append(key)
+
+        if key in self.failed:
+            return None
+
+        if key in self.flaky:
+            self.flaky.discard(key)
+            return None
+
+        return data
+
+    def get_security_list(self, market, start):
+        if start in self.extra:
+            return self.reply(start, [{'code': str(start)}])
+
+        return self.reply(start, [{'code': str(x)} for x in range(start, min(start + 1000, self.total))])
+
+    def get_company_info_category(self, market, code):
+        return [{'name': f'name{x}', 'filename': f'{code}.txt', 'start': x, 'length': 10} for x in range(10)]
+
+    def get_company_info_content(self, market, code, filename, start, length):
+        return self.reply(start, f'content{start}')
+
+    def get_security_bars(self, category, market, code, start, count):
+        days = self.days[max(len(self.days) - start - count, 0) : len(self.days) - start]
+        bars = [
+            {
+                'open': 1.0, 'close': 2.0, 'high': 3.0, 'low': 0.5, 'vol': 100.0, 'amount': 200.0,
+                'year': x.year, 'month': x.month, 'day': x.day, 'hour': 15, 'minute': 0,
+                'datetime': x.strftime('%Y-%m-%d 15:00'),
+            }
+            for x in days
+        ]
+
+        return self.reply(start, bars)
+
+    def get_markets(self):
+        return self.reply('markets', self.markets)
+
+    def get_instrument_count(self):
+        return self.total
+
+    def get_instrument_info(self, start, count):
+        return self.reply(start, [{'market': 47, 'code': str(x)} for x in range(start, min(start + count, self.total))])
+
+    def get_instrument_quote(self, market, code):
+        return self.reply(code, [] if code == 'BAD' else [{'market': market, 'code': code, 'price': 1.0}])
+
+    def close(self):
+        self.closed = True
+
+
+class FakeQuotes(BaseQuotes):
+    """
+    使用 FakeClient 的行情接口, 工作连接由主连接 clone 而来
+
+    :param connect: 创建工作连接的耗时
+    :param fail: 创建工作连接是否失败
+    :param gate: threading.Event, 设置之前工作连接一直处于创建中
+    """
+
+    def __init__(self, client=None, connect=0, fail=False, gate=None):
+        self.client, self.connect, self.fail, self.gate = client, connect, fail, gate
+        self.started, self.spawned = 0, []
+        self.setup_pool()
+
+    def spawn(self):
+        self.started += 1
+        time.sleep(self.connect)
+        self.gate and self.gate.wait()
+
+        if self.fail:
+            raise ConnectionError('connect refused')
+
+        self.spawned.append(self.client.clone() if self.client else FakeClient())
+        return self.spawned[-1]
+
+    def wait_closed(self, timeout=5):
+        """
+        等待后台创建的工作连接全部就绪并关闭
+
+        :return: bool
+        """
+
+        def done():
+            return len(self.spawned) == self.started and all(x.closed for x in self.spawned)
+
+        deadline = time.monotonic() + timeout
+
+        while not done() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        return done()
+
+
+class FakeStdQuotes(FakeQuotes, StdQuotes):
+    pass
+
+
+class FakeExtQuotes(FakeQuotes, ExtQuotes):
+    pass
@@ -1,8 +1,17 @@
+import threading
+import time
 import unittest
 
+import pandas as pd
 import pytest
+from tdxpy.hq import TdxHq_API
 
+from mootdx.quotes import BaseQuotes
+from mootdx.quotes import check_empty
 from mootdx.quotes import Quotes
+from mootdx.quotes import valid_server
+from tests.conftest import FakeClient
+from tests.conftest import FakeQuotes
 
 
 @pytest.mark.skip(reason='暂时不做重复测试')
@@ -29,3 +38,99 @@ class TestStdQuotes(unittest.TestCase):
         server = ('112.74.214.43', 7727)
         client = Quotes.factory(market='ext', server=server, verbose=2, timeout=10)  # 标准市场
         assert client.server == server, server
+
+
+def test_parallel_keep_order():
+    client = FakeQuotes(client=FakeClient(total=20000))
+    params = [{'market': 1, 'start': x} for x in range(0, 20000, 1000)]
+    results = client.parallel('get_security_list', params)
+
+    assert [x[0]['code'] for x in results] == [str(x) for x in range(0, 20000, 1000)]
+    assert 0 < len(client.clients) <= client.workers
+
+    client.close()
+    assert client.clients == []
+
+
+def test_pool_reuse_main_client():
+    main = FakeClient(total=8000, delay=0.05)
+    client = FakeQuotes(client=main)
+
+    results = client.parallel('get_security_list', [{'market': 1, 'start': x} for x in range(0, 8000, 1000)])
+
+    # 主连接直接加入连接池, 最多再创建 workers - 1 个连接
+    assert len(results) == 8 and len(main.log) == 8
+    assert client.clients[0] is main and main.calls > 0
+    assert client.started <= client.workers - 1
+
+
+def test_pool_close_late_clients():
+    main, gate = FakeClient(total=8000), threading.Event()
+    client = FakeQuotes(client=main, gate=gate)
+
+    client.parallel('get_security_list', [{'market': 1, 'start': x} for x in range(0, 8000, 1000)])
+    client.close()
+    gate.set()
+
+    # 关闭后才就绪的连接不会再加入连接池
+    assert client.started and client.wait_closed()
+    assert client.clients == [] and client.idle.empty()
+
+
+def test_pool_skip_late_clients():
+    main, gate = FakeClient(total=8000), threading.Event()
+    client = FakeQuotes(client=main, gate=gate)
+
+    client.parallel('get_security_list', [{'market': 1, 'start': x} for x in range(0, 8000, 1000)])
+    gate.set()
+
+    # 请求已经处理完毕, 就绪的连接直接关闭
+    assert main.calls == 8
+    assert client.started and client.wait_closed()
+    assert client.clients == [main] and not main.closed
+
+
+def test_pool_drop_failed_client():
+    main = FakeClient(total=4000)
+    client = FakeQuotes(client=main, fail=True)
+
+    results = client.parallel('get_security_list', [{'market': 1, 'start': x} for x in range(0, 4000, 1000)])
+
+    assert len(results) == 4
+    assert main.calls == 4
+
+    time.sleep(0.1)
+    assert client.clients == [main]
+
+    with pytest.raises(ConnectionError):
+        FakeQuotes(fail=True).request('get_security_list', market=1, start=0)
+
+
+def test_spawn_connect_failed():
+    client = FakeQuotes(client=TdxHq_API())
+    client.server, client.timeout = ('127.0.0.1', 1), 1
+
+    with pytest.raises(ConnectionError):
+        BaseQuotes.spawn(client)
+
+
+def test_valid_server():
+    assert valid_server(['127.0.0.1', '7709']) == ('127.0.0.1', 7709)
+    assert valid_server(('127.0.0.1', 7709)) == ('127.0.0.1', 7709)
+    assert valid_server(None) is None
+
+    with pytest.raises(ValueError):
+        valid_server(('localhost', 7709))
+
+    with pytest.raises(ValueError):
+        valid_server(['127.0.0.1'])
+
+
+def test_check_empty():
+    assert check_empty(pd.DataFrame())
+    assert not check_empty(pd.DataFrame({'flag': [False, False]}))
+    assert check_empty(pd.Series(dtype=float))
+    assert not check_empty(pd.Series([0]))
+    assert check_empty([])
+    assert check_empty(None)
+    assert not check_empty([{'code': '000001'}])
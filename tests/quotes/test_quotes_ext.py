@@ -1,9 +1,18 @@
+import asyncio
+import gc
 import unittest
+import weakref
 
+import pandas as pd
 import pytest
+from tenacity import wait_none
 
 from mootdx.consts import KLINE_DAILY
+from mootdx.exceptions import MootdxException
+from mootdx.quotes import ExtQuotes
 from mootdx.quotes import Quotes
+from tests.conftest import FakeClient
+from tests.conftest import FakeExtQuotes
 
 
 @pytest.mark.skip(reason='暂时不做测试')
@@ -62,3 +71,73 @@ class TestExtQuotes(unittest.TestCase):
     def test_transactions(self):
         data = self.client.transactions(market=47, symbol='IFL0', date='20170810', start=1800)
         self.assertEqual(data.empty, False)
+
+
+def test_ttl_cache_copy():
+    client = FakeExtQuotes(client=FakeClient())
+
+    data = client.markets()
+    data['market'] = 999
+
+    assert client.markets()['market'].tolist() == [47]
+    assert client.client.calls == 1
+
+
+def test_ttl_cache_skip_empty(monkeypatch):
+    monkeypatch.setattr(ExtQuotes.markets.retry, 'wait', wait_none())
+    client = FakeExtQuotes(client=FakeClient(markets=[]))
+
+    assert client.markets().empty
+    assert client.markets().empty
+    assert client.client.calls == 6
+
+
+def test_ttl_cache_release_instance():
+    client = FakeExtQuotes(client=FakeClient())
+    client.markets()
+
+    ref = weakref.ref(client)
+    del client
+    gc.collect()
+
+    assert ref() is None
+
+
+def test_instruments_retry_failed_page():
+    client = FakeExtQuotes(client=FakeClient(total=950, flaky=[200]))
+    data = client.instruments()
+
+    assert data['code'].tolist() == [str(x) for x in range(950)]
+    assert len(client.client.log) == 11
+
+
+def test_instruments_raise_failed_page(monkeypatch):
+    monkeypatch.setattr(ExtQuotes.instruments.retry, 'wait', wait_none())
+    client = FakeExtQuotes(client=FakeClient(total=950, failed=[300]))
+
+    with pytest.raises(MootdxException):
+        client.instruments()
+
+
+def test_quotes_keep_symbols(monkeypatch):
+    monkeypatch.setattr(ExtQuotes._request.retry, 'wait', wait_none())
+    client = FakeExtQuotes(client=FakeClient(flaky=['FLAKY']))
+
+    data = client.quotes([(47, 'IF1709'), '42#BAD', (47, 'FLAKY'), '42#IMCI'])
+
+    assert data['code'].tolist() == ['IF1709', 'BAD', 'FLAKY', 'IMCI']
+    assert data['market'].tolist() == [47, 42, 47, 42]
+    assert pd.isna(data['price'][1]) and data['price'].notna().sum() == 3
+
+
+def test_aquote(monkeypatch):
+    monkeypatch.setattr(ExtQuotes._request.retry, 'wait', wait_none())
+    client = FakeExtQuotes(client=FakeClient())
+
+    async def main():
+        return await asyncio.gather(client.aquote(47, 'IF1709'), client.aquote(symbol='42#BAD'))
+
+    data, empty = asyncio.run(main())
+
+    assert data['code'].tolist() == ['IF1709']
+    assert empty.empty
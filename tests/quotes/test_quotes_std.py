@@ -1,12 +1,17 @@
+import threading
 import unittest
 from datetime import datetime
 
+import pandas as pd
 import pytest
 
 from mootdx.consts import MARKET_SH
+from mootdx.exceptions import MootdxException
 from mootdx.exceptions import MootdxValidationException
 from mootdx.logger import logger
 from mootdx.quotes import Quotes
+from tests.conftest import FakeClient
+from tests.conftest import FakeStdQuotes
 
 
 class TestStdQuotes(unittest.TestCase):
@@ -128,3 +133,86 @@ class TestStdRaises(unittest.TestCase):
 
         exec_msg = e.value.args[0]
         assert exec_msg == '市场代码错误, 目前只支持沪深市场'
+
+
+@pytest.mark.parametrize('total', [16000, 20321, 321, 0])
+def test_stocks_pages(total):
+    client = FakeStdQuotes(client=FakeClient(total))
+    data = client.stocks(1)
+
+    if total:
+        assert data['code'].tolist() == [str(x) for x in range(total)]
+    else:
+        assert data is None
+
+
+def test_stocks_retry_failed_page():
+    client = FakeStdQuotes(client=FakeClient(5321, flaky=[3000]))
+    assert len(client.stocks(1)) == 5321
+
+
+def test_stocks_raise_failed_page():
+    client = FakeStdQuotes(client=FakeClient(5321, failed=[3000]))
+
+    with pytest.raises(MootdxException):
+        client.stocks(1)
+
+
+def test_stocks_raise_data_after_short_page():
+    client = FakeStdQuotes(client=FakeClient(5321, extra=[7000]))
+
+    with pytest.raises(MootdxException):
+        client.stocks(1)
+
+
+def test_F10_cold_pool():
+    main, gate = FakeClient(), threading.Event()
+    client = FakeStdQuotes(client=main, gate=gate)
+
+    result = client.F10(symbol='000001')
+    gate.set()
+
+    # 新连接就绪之前, 请求全部在主连接上完成, 不等待连接创建
+    assert main.calls == 10
+    assert result == {f'name{x}': f'content{x}' for x in range(10)}
+
+
+def test_F10_failed_worker():
+    client = FakeStdQuotes(client=FakeClient(flaky=[3]), fail=True)
+    assert client.F10(symbol='000001') == {f'name{x}': f'content{x}' for x in range(10)}
+
+
+def test_F10_keep_partial_result():
+    client = FakeStdQuotes(client=FakeClient(failed=[3]))
+    result = client.F10(symbol='000001')
+
+    assert result['name3'] is None
+    assert {k: v for k, v in result.items() if k != 'name3'} == {f'name{x}': f'content{x}' for x in range(10) if x != 3}
+
+
+def test_get_k_data():
+    bars = FakeClient()
+    client = FakeStdQuotes(client=bars)
+
+    end = bars.days[-30]
+    data = client.get_k_data('600300', bars.days[-1200].strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'))
+
+    assert len(bars.log) > 1
+    assert data.columns.tolist() == ['open', 'close', 'high', 'low', 'vol', 'amount', 'date', 'code']
+    assert isinstance(data.index, pd.DatetimeIndex) and data.index.name == 'date'
+    assert data.index.is_monotonic_increasing and data.index.is_unique
+    assert pd.api.types.is_datetime64_any_dtype(data['date'])
+    assert (data['date'] == data.index).all()
+    assert set(data['code']) == {'600300'}
+
+    # 区间为 [start_date, end_date), 不包含结束日期
+    assert data.index[0] >= bars.days[-1200] and data.index[-1] == bars.days[-31]
+    assert end not in data.index
+
+
+def test_get_k_data_failed_page():
+    bars = FakeClient(failed=[800])
+    client = FakeStdQuotes(client=bars)
+
+    with pytest.raises(MootdxException):
+        client.get_k_data('600300', bars.days[-2000].strftime('%Y-%m-%d'), bars.days[-1].strftime('%Y-%m-%d'))